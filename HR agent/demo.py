@@ -5,6 +5,9 @@ This script demonstrates the agent's capabilities with example inputs.
 """
 
 import os
+import asyncio
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from job_description_agent import JobDescriptionAgent
 
 def demo_job_description_agent():
@@ -34,16 +37,27 @@ def demo_job_description_agent():
         "product manager fintech"
     ]
     
-    print(f"Running {len(examples)} examples...\n")
+    print(f"Running {len(examples)} examples concurrently...\n")
     
-    for i, example in enumerate(examples, 1):
+    async def generate_all():
+        return await asyncio.gather(*[agent.agenerate_job_description(example) for example in examples])
+    
+    try:
+        # Generate all job descriptions concurrently
+        job_descs = asyncio.run(generate_all())
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return
+    
+    # Write the markdown files in the background while results are displayed
+    pool = ThreadPoolExecutor(max_workers=4)
+    saves = []
+    
+    for i, (example, job_desc) in enumerate(zip(examples, job_descs), 1):
         print(f"📝 Example {i}: {example}")
         print("-" * 40)
         
         try:
-            # Generate job description
-            job_desc = agent.generate_job_description(example)
-            
             if job_desc:
                 # Display basic info
                 print(f"✅ Generated: {job_desc.job_title}")
@@ -61,9 +75,8 @@ def demo_job_description_agent():
                 # Save to file
                 filename = f"demo_job_{i}_{job_desc.job_title.lower().replace(' ', '_')}.md"
                 formatted_output = agent.format_job_description(job_desc)
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(formatted_output)
-                print(f"💾 Saved to: {filename}")
+                saves.append((filename, pool.submit(pathlib.Path(filename).write_text, formatted_output, encoding='utf-8')))
+                print(f"💾 Saving to: {filename}")
                 
             else:
                 print("❌ Failed to generate job description")
@@ -73,6 +86,12 @@ def demo_job_description_agent():
         
         print("\n" + "=" * 50 + "\n")
     
+    # Wait for pending file writes before finishing
+    pool.shutdown(wait=True)
+    for filename, future in saves:
+        if future.exception():
+            print(f"❌ Failed to save {filename}: {future.exception()}")
+    
     print("🎉 Demo completed!")
     print("Check the generated .md files to see the full job descriptions.")
     print("\nTo run the full application:")
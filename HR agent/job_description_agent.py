@@ -5,19 +5,63 @@ Generates comprehensive job descriptions using OpenAI GPT models
 """
 
 import os
-from typing import Optional, List
-from pydantic import BaseModel
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+import re
+import time
+import atexit
+import tempfile
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, List, Tuple
+import numpy as np
+import orjson
+import pydantic
 from dotenv import load_dotenv
+from sentence_transformers import SentenceTransformer
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 # Import OpenAI directly to avoid LangChain compatibility issues
+import httpx
 import openai
+from openai import APIConnectionError, APIStatusError
 
 # Load environment variables
 load_dotenv()
 
-class JobDescription(BaseModel):
+def _is_transient(exc: BaseException) -> bool:
+    """Whether an OpenAI error is worth retrying; mirrors the SDK's own retry rules"""
+    if isinstance(exc, APIConnectionError):  # includes APITimeoutError
+        return True
+    return isinstance(exc, APIStatusError) and (exc.status_code in (408, 409, 429) or exc.status_code >= 500)
+
+# Retry policy for transient OpenAI errors (timeouts, conflicts, rate limits, 5xx, dropped connections)
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(1, 8),
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+# Semantic cache settings; the cache files live next to this module, not in the working directory
+CACHE_PATH = Path(__file__).resolve().parent / "semantic_cache"
+CACHE_MAX_ENTRIES = 1000
+CACHE_SIMILARITY_THRESHOLD = 0.92
+
+# Experience level keywords, checked in priority order against the lowercased input.
+# "Senior X" and "Junior X" embed almost identically, so cached results are only
+# reused for inputs at the same level. This app does not import the root agent, so
+# the list is its own: it only partitions the cache, with no earlier behavior to
+# keep, so it matches whole words ("internal" is not "intern") and spells out the
+# inflected forms the root agent's substring matching picks up implicitly.
+_EXPERIENCE_LEVEL_PATTERNS = [
+    ("entry", re.compile(r"\b(?:entry|junior|jr|fresher|freshers|new grad|new graduate|interns?|internship|trainee)\b")),
+    ("mid", re.compile(r"\b(?:mid|intermediate|experienced)\b")),
+    ("senior", re.compile(r"\b(?:senior|sr|lead|leads|leader|principal)\b")),
+    ("executive", re.compile(r"\b(?:executives?|directors?|vp|svp|evp|head|chief)\b"))
+]
+
+@dataclass(slots=True)
+class JobDescription:
     """Structured job description model"""
     job_title: str
     department: str
@@ -32,42 +76,136 @@ class JobDescription(BaseModel):
     benefits: List[str]
     company_culture: str
 
-class JobDescriptionAgent:
-    """AI-powered job description generator"""
+class InvalidResponseError(ValueError):
+    """Raised when a response is not a valid JobDescription JSON document"""
+
+class TruncatedResponseError(InvalidResponseError):
+    """Raised when a response stops at the max_tokens limit before the JSON is complete"""
+
+_TRUNCATED_MESSAGE = "The response hit the max_tokens limit before the job description was complete"
+
+def _experience_level(job_input: str) -> str:
+    """Experience level named in a job input, "mid" if none is"""
+    input_lower = job_input.lower()
+    return next((level for level, pattern in _EXPERIENCE_LEVEL_PATTERNS if pattern.search(input_lower)), "mid")
+
+def _write_atomic(path: Path, write):
+    """Call write(file) on a uniquely named temp file, then swap it into place"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+# (model, organization context, experience level) a cached result was generated for
+CacheKey = Tuple[str, str, str]
+
+class _SemanticCache:
+    """Bounded embedding cache of generated job descriptions, shared by every agent in the process
     
-    def __init__(self, model_name: str = "gpt-4o-mini"):
-        """Initialize the agent with specified model"""
-        self.model_name = model_name
-        self.organization_context = ""
-        
-        # Set OpenAI API key
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
-        
-    def set_organization_context(self, organization: str):
-        """Set organization context for customized descriptions"""
-        # Simple organization contexts for basic customization
-        org_contexts = {
-            "Technology Company": "A leading technology company focused on innovation and cutting-edge solutions.",
-            "Consulting Firm": "A professional consulting firm helping businesses achieve their goals.",
-            "Startup": "A dynamic startup fostering creativity and entrepreneurship.",
-            "Enterprise": "A large enterprise organization with established processes and growth opportunities."
-        }
-        self.organization_context = org_contexts.get(organization, "")
+    Embeddings live in one preallocated matrix used as a ring buffer, so a lookup is a
+    single matrix-vector product and the oldest entry is replaced once the cache is full.
+    It is persisted as a .npy matrix plus a JSON list of keys and results.
+    """
     
-    def generate_job_description(self, job_input: str, temperature: float = 0.7) -> Optional[JobDescription]:
-        """Generate a comprehensive job description from simple input"""
+    def __init__(self, path: Path, capacity: int):
+        self._embeddings_file = path.with_suffix(".npy")
+        self._entries_file = path.with_suffix(".json")
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
         
-        # Create the prompt
-        org_context = f"Company Context: {self.organization_context}" if self.organization_context else ""
-        
-        prompt = f"""
-You are an expert HR professional. Create a comprehensive, professional job description based on the input provided.
+        self._embeddings: Optional[np.ndarray] = None  # (capacity, dim), allocated on first insert
+        self._key_ids = np.full(capacity, -1, dtype=np.int32)
+        self._key_index: Dict[CacheKey, int] = {}
+        self._keys: List[Optional[CacheKey]] = [None] * capacity
+        self._results: List[Optional[JobDescription]] = [None] * capacity
+        self._size = 0
+        self._next = 0
+    
+    def lookup(self, key: CacheKey, embedding: np.ndarray) -> Optional[JobDescription]:
+        """Most similar cached result under the same key, if it clears the threshold"""
+        with self._lock:
+            self._ensure_loaded()
+            key_id = self._key_index.get(key)
+            if key_id is None:
+                return None
+            
+            similarities = self._embeddings[:self._size] @ embedding
+            similarities[self._key_ids[:self._size] != key_id] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] >= CACHE_SIMILARITY_THRESHOLD:
+                return self._results[best]
+            return None
+    
+    def add(self, key: CacheKey, embedding: np.ndarray, job_desc: JobDescription):
+        """Store a result, replacing the oldest entry when the cache is full"""
+        with self._lock:
+            self._ensure_loaded()
+            self._insert(key, embedding, job_desc)
+            self._dirty = True
+    
+    def save(self):
+        """Persist the cache if it changed since it was loaded"""
+        with self._lock:
+            if not self._dirty:
+                return
+            # Oldest first, so eviction order survives a reload
+            order = (self._next - self._size + np.arange(self._size)) % self._capacity
+            embeddings = self._embeddings[order]
+            entries = [{"key": self._keys[i], "result": asdict(self._results[i])} for i in order]
+            try:
+                _write_atomic(self._embeddings_file, lambda f: np.save(f, embeddings, allow_pickle=False))
+                _write_atomic(self._entries_file, lambda f: f.write(orjson.dumps(entries)))
+                self._dirty = False
+            except Exception as e:
+                print(f"Error saving cache: {e}")
+    
+    def _ensure_loaded(self):
+        """Load the cache persisted by a previous run, once"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not (self._embeddings_file.exists() and self._entries_file.exists()):
+            return
+        try:
+            embeddings = np.load(self._embeddings_file, allow_pickle=False)
+            entries = orjson.loads(self._entries_file.read_bytes())
+            if embeddings.ndim != 2 or len(embeddings) != len(entries):
+                print("Ignoring semantic cache files that do not match each other")
+                return
+            for embedding, entry in zip(embeddings[-self._capacity:], entries[-self._capacity:]):
+                self._insert(tuple(entry["key"]), embedding, JobDescription(**entry["result"]))
+        except Exception as e:
+            print(f"Error loading cache: {e}")
+    
+    def _insert(self, key: CacheKey, embedding: np.ndarray, job_desc: JobDescription):
+        """Write an entry into the next ring-buffer row"""
+        if self._embeddings is None:
+            self._embeddings = np.empty((self._capacity, embedding.shape[0]), dtype=np.float32)
+        row = self._next
+        self._embeddings[row] = embedding
+        self._key_ids[row] = self._key_index.setdefault(key, len(self._key_index))
+        self._keys[row] = key
+        self._results[row] = job_desc
+        self._next = (row + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
 
-{org_context}
+# Simple organization contexts for basic customization
+ORG_CONTEXTS = {
+    "Technology Company": "A leading technology company focused on innovation and cutting-edge solutions.",
+    "Consulting Firm": "A professional consulting firm helping businesses achieve their goals.",
+    "Startup": "A dynamic startup fostering creativity and entrepreneurship.",
+    "Enterprise": "A large enterprise organization with established processes and growth opportunities."
+}
 
-Job Input: {job_input}
+# Instructions shared by every request. They go first, in the system message,
+# so OpenAI can serve the repeated prefix from its prompt cache.
+_SYSTEM_PROMPT = """You are an expert HR professional. Create a comprehensive, professional job description based on the job input provided by the user.
 
 Generate a detailed job description in JSON format with exactly these fields:
 - job_title: Professional, specific title
@@ -85,88 +223,256 @@ Generate a detailed job description in JSON format with exactly these fields:
 
 Make the description inclusive, professional, and appealing to qualified candidates.
 
-Return only valid JSON format.
-"""
+Return only valid JSON format."""
+
+# Strict JSON schema response format; the server guarantees output matching JobDescription
+_JOB_DESCRIPTION_SCHEMA = pydantic.TypeAdapter(JobDescription).json_schema()
+JOB_DESCRIPTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "JobDescription",
+        "schema": {**_JOB_DESCRIPTION_SCHEMA, "additionalProperties": False},
+        "strict": True
+    }
+}
+
+_SEMANTIC_CACHE = _SemanticCache(CACHE_PATH, CACHE_MAX_ENTRIES)
+atexit.register(_SEMANTIC_CACHE.save)
+
+class JobDescriptionAgent:
+    """AI-powered job description generator"""
+    
+    def __init__(self, model_name: str = "gpt-4o-mini"):
+        """Initialize the agent with specified model"""
+        self.model_name = model_name
+        self.organization_context = ""
+        
+        # Read the OpenAI API key once; the clients below hold their own copy
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+        
+        # Reuse one client (and its connection pool) across requests. HTTP/2 lets
+        # concurrent requests share a single connection instead of one each.
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=20)
+        self.client = openai.OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(
+                transport=httpx.HTTPTransport(http2=True, retries=2, limits=limits)
+            )
+        )
+        
+        # Async client for generating several descriptions concurrently
+        self.async_client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(http2=True, retries=2, limits=limits)
+            )
+        )
+        
+        # Semantic cache of earlier results, shared with every other agent in the process
+        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        self._cache = _SEMANTIC_CACHE
+        
+    def set_organization_context(self, organization: str):
+        """Set organization context for customized descriptions"""
+        self.organization_context = ORG_CONTEXTS.get(organization, "")
+    
+    def generate_job_description(self, job_input: str, temperature: float = 0.7) -> Optional[JobDescription]:
+        """Generate a comprehensive job description from simple input"""
         
         try:
-            # Use OpenAI directly
-            client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            # Reuse a cached result for the same or a near-identical input
+            key, embedding, cached = self._cache_lookup(job_input)
+            if cached:
+                return cached
             
-            response = client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR professional. Always respond with valid JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=2000
-            )
+            # Structured output: the server returns JSON matching the JobDescription schema
+            response = self._chat_create(job_input, temperature)
             
-            # Parse the JSON response
-            import json
-            result_text = response.choices[0].message.content.strip()
+            job_desc = self._parse_choice(response.choices[0].message.content, response.choices[0].finish_reason)
+            self._cache.add(key, embedding, job_desc)
+            return job_desc
             
-            # Clean up the response if it has markdown formatting
-            if result_text.startswith("```json"):
-                result_text = result_text.replace("```json", "").replace("```", "").strip()
+        except Exception as e:
+            print(f"Error generating job description: {e}")
+            return None
+    
+    async def agenerate_job_description(self, job_input: str, temperature: float = 0.7) -> Optional[JobDescription]:
+        """Async variant of generate_job_description for concurrent generation"""
+        
+        try:
+            # Reuse a cached result for the same or a near-identical input
+            key, embedding, cached = self._cache_lookup(job_input)
+            if cached:
+                return cached
             
-            result_data = json.loads(result_text)
+            # Structured output: the server returns JSON matching the JobDescription schema
+            response = await self._achat_create(job_input, temperature)
             
-            # Create JobDescription object
-            job_desc = JobDescription(**result_data)
+            job_desc = self._parse_choice(response.choices[0].message.content, response.choices[0].finish_reason)
+            self._cache.add(key, embedding, job_desc)
             return job_desc
             
         except Exception as e:
             print(f"Error generating job description: {e}")
             return None
     
+    def stream_job_description(self, job_input: str, temperature: float = 0.7) -> Iterator[str]:
+        """Stream the raw JSON job description as it is generated
+        
+        Pass the joined chunks to parse_job_description once the stream ends.
+        Raises TruncatedResponseError after the last chunk if the response hit max_tokens.
+        """
+        stream = self.client.chat.completions.create(
+            **self._build_request_body(job_input, temperature),
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices:
+                choice = chunk.choices[0]
+                yield choice.delta.content or ""
+                if choice.finish_reason == "length":
+                    raise TruncatedResponseError(_TRUNCATED_MESSAGE)
+    
+    def generate_job_descriptions_batch(self, job_inputs: List[str], temperature: float = 0.7,
+                                        poll_interval: float = 10.0) -> List[Optional[JobDescription]]:
+        """Generate several job descriptions in one OpenAI Batch API job
+        
+        Results are returned in the same order as the inputs; entries that
+        failed come back as None.
+        """
+        # One JSONL line per input, each carrying the same body a direct call would send
+        lines = [
+            orjson.dumps({
+                "custom_id": f"job-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request_body(job_input, temperature)
+            })
+            for i, job_input in enumerate(job_inputs)
+        ]
+        batch_file = self.client.files.create(
+            file=("job_descriptions.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        # Wait for the job to finish
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        results: List[Optional[JobDescription]] = [None] * len(job_inputs)
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"Batch job {batch.id} ended with status: {batch.status}")
+            return results
+        
+        output = self.client.files.content(batch.output_file_id).text
+        # A malformed line only loses its own result, not the ones already parsed
+        for line_number, line in enumerate(output.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+                index = int(record["custom_id"].split("-", 1)[1])
+                if not 0 <= index < len(results):
+                    raise ValueError(f"unexpected custom_id {record['custom_id']!r}")
+                choice = record["response"]["body"]["choices"][0]
+                results[index] = self._parse_choice(choice["message"]["content"], choice.get("finish_reason"))
+            except Exception as e:
+                print(f"Error parsing batch result on output line {line_number}: {e}")
+        
+        return results
+    
+    @_retry_transient
+    def _chat_create(self, job_input: str, temperature: float):
+        """Request a structured completion, retrying transient API errors"""
+        # tenacity owns the retry policy here, so turn off the SDK's own retries
+        return self.client.with_options(max_retries=0).chat.completions.create(
+            **self._build_request_body(job_input, temperature)
+        )
+    
+    @_retry_transient
+    async def _achat_create(self, job_input: str, temperature: float):
+        """Async variant of _chat_create"""
+        return await self.async_client.with_options(max_retries=0).chat.completions.create(
+            **self._build_request_body(job_input, temperature)
+        )
+    
+    def _build_request_body(self, job_input: str, temperature: float) -> dict:
+        """Build the chat completion request body for a job input"""
+        
+        # Stable instructions first, per-organization context after, job input last
+        system_prompt = _SYSTEM_PROMPT
+        if self.organization_context:
+            system_prompt += f"\n\nCompany Context: {self.organization_context}"
+        
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Job Input: {job_input}"}
+            ],
+            "temperature": temperature,
+            "max_tokens": 1200,
+            "response_format": JOB_DESCRIPTION_RESPONSE_FORMAT
+        }
+    
+    def _parse_choice(self, content: Optional[str], finish_reason: Optional[str]) -> JobDescription:
+        """Parse a finished completion choice, reporting a max_tokens cut-off as TruncatedResponseError"""
+        if finish_reason == "length":
+            raise TruncatedResponseError(_TRUNCATED_MESSAGE)
+        return self.parse_job_description(content)
+    
+    def parse_job_description(self, result_text: str) -> JobDescription:
+        """Parse a structured-output JSON response into a JobDescription"""
+        try:
+            return JobDescription(**orjson.loads(result_text))
+        except (orjson.JSONDecodeError, TypeError) as e:
+            raise InvalidResponseError(f"Invalid job description response: {e}") from e
+    
+    def _cache_lookup(self, job_input: str) -> Tuple[CacheKey, np.ndarray, Optional[JobDescription]]:
+        """Embed the input and return a cached result if a similar input was seen"""
+        # Only results for the same model, organization context and experience level are reusable
+        key = (self.model_name, self.organization_context, _experience_level(job_input))
+        embedding = self.embedder.encode(job_input, normalize_embeddings=True)
+        return key, embedding, self._cache.lookup(key, embedding)
+    
     def format_job_description(self, job_desc: JobDescription) -> str:
         """Format job description as markdown"""
         
-        formatted = f"""
-# {job_desc.job_title}
-
-**Department:** {job_desc.department}  
-**Experience Level:** {job_desc.experience_level}  
-**Location:** {job_desc.location}  
-**Salary Range:** {job_desc.salary_range}
-
-## Job Summary
-{job_desc.job_summary}
-
-## Key Responsibilities
-"""
+        parts = [
+            f"# {job_desc.job_title}",
+            "",
+            f"**Department:** {job_desc.department}  ",
+            f"**Experience Level:** {job_desc.experience_level}  ",
+            f"**Location:** {job_desc.location}  ",
+            f"**Salary Range:** {job_desc.salary_range}",
+            "",
+            "## Job Summary",
+            job_desc.job_summary,
+            "",
+            "## Key Responsibilities"
+        ]
+        parts.extend(f"{i}. {responsibility}" for i, responsibility in enumerate(job_desc.key_responsibilities, 1))
         
-        for i, responsibility in enumerate(job_desc.key_responsibilities, 1):
-            formatted += f"{i}. {responsibility}\n"
+        parts += ["", "## Required Skills"]
+        parts.extend(f"• {skill}" for skill in job_desc.required_skills)
         
-        formatted += f"""
-## Required Skills
-"""
-        for skill in job_desc.required_skills:
-            formatted += f"• {skill}\n"
+        parts += ["", "## Preferred Skills"]
+        parts.extend(f"• {skill}" for skill in job_desc.preferred_skills)
         
-        formatted += f"""
-## Preferred Skills
-"""
-        for skill in job_desc.preferred_skills:
-            formatted += f"• {skill}\n"
+        parts += ["", "## Education", job_desc.education, "", "## Benefits"]
+        parts.extend(f"• {benefit}" for benefit in job_desc.benefits)
         
-        formatted += f"""
-## Education
-{job_desc.education}
-
-## Benefits
-"""
-        for benefit in job_desc.benefits:
-            formatted += f"• {benefit}\n"
-        
-        formatted += f"""
-## Company Culture
-{job_desc.company_culture}
-"""
+        parts += ["", "## Company Culture", job_desc.company_culture]
         
-        return formatted.strip()
+        return "\n".join(parts).strip()
 
 def main():
     """Command line interface for the job description agent"""
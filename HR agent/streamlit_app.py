@@ -7,7 +7,7 @@ Clean, minimal interface with no configuration options
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from job_description_agent import JobDescriptionAgent
+from job_description_agent import InvalidResponseError, JobDescriptionAgent, TruncatedResponseError
 
 # Load environment variables
 load_dotenv()
@@ -19,6 +19,31 @@ st.set_page_config(
     layout="wide"
 )
 
+# Quick examples shown in the sidebar
+EXAMPLES = [
+    "senior python developer",
+    "marketing manager entry level",
+    "data analyst with 3 years experience",
+    "software engineer remote",
+    "product manager fintech"
+]
+
+FEATURES = [
+    "🎯 Professional formatting",
+    "📋 Industry-standard sections",
+    "🌍 Inclusive language",
+    "💰 Realistic salary ranges",
+    "🏢 Company culture info",
+    "🎁 Benefits package",
+    "📄 Markdown export",
+    "⚡ Instant generation"
+]
+
+@st.cache_resource
+def get_agent(model_name: str = "gpt-4o-mini") -> JobDescriptionAgent:
+    """Create the agent once and share it across reruns and sessions"""
+    return JobDescriptionAgent(model_name=model_name)
+
 def main():
     """Main Streamlit application"""
     
@@ -38,15 +63,7 @@ def main():
         st.header("📚 Quick Examples")
         st.markdown("Click any example to try it:")
         
-        examples = [
-            "senior python developer",
-            "marketing manager entry level", 
-            "data analyst with 3 years experience",
-            "software engineer remote",
-            "product manager fintech"
-        ]
-        
-        for example in examples:
+        for example in EXAMPLES:
             if st.button(example, key=f"ex_{example}", use_container_width=True):
                 st.session_state['job_input'] = example
                 st.rerun()
@@ -67,61 +84,65 @@ def main():
         # Generate button
         if st.button("🚀 Generate Job Description", type="primary", use_container_width=True):
             if job_input.strip():
-                with st.spinner("🔄 Generating professional job description..."):
-                    try:
-                        # Initialize agent with default settings
-                        agent = JobDescriptionAgent(model_name="gpt-4o-mini")
-                        
-                        # Generate job description
-                        job_desc = agent.generate_job_description(job_input)
+                placeholder = st.empty()
+                try:
+                    # Reuse the agent kept across reruns
+                    agent = get_agent()
+                    
+                    # Show a cached result for the same or a near-identical input right away
+                    key, embedding, job_desc = agent._cache_lookup(job_input)
+                    if not job_desc:
+                        # Stream the raw response so progress shows immediately
+                        with placeholder.container():
+                            st.caption("🔄 Generating professional job description...")
+                            result_text = st.write_stream(agent.stream_job_description(job_input))
                         
-                        if job_desc:
-                            # Format output
-                            formatted_output = agent.format_job_description(job_desc)
-                            
-                            # Success message
-                            st.success("✅ Job description generated successfully!")
-                            
-                            # Display result
-                            st.markdown("### 📄 Generated Job Description")
-                            st.markdown(formatted_output)
-                            
-                            # Download button
-                            st.download_button(
-                                label="📥 Download as Markdown File",
-                                data=formatted_output,
-                                file_name=f"job_description_{job_desc.job_title.lower().replace(' ', '_')}.md",
-                                mime="text/markdown",
-                                use_container_width=True
-                            )
-                            
-                            # Celebration
-                            st.balloons()
-                            
-                        else:
-                            st.error("❌ Failed to generate job description. Please try again with different input.")
-                            
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
-                        st.info("💡 Try rephrasing your input or check your API configuration.")
+                        # Parse once the stream has finished, then cache the result
+                        job_desc = agent.parse_job_description(result_text)
+                        placeholder.empty()
+                        agent._cache.add(key, embedding, job_desc)
+                    
+                    # Format output
+                    formatted_output = agent.format_job_description(job_desc)
+                    
+                    # Success message
+                    st.success("✅ Job description generated successfully!")
+                    
+                    # Display result
+                    st.markdown("### 📄 Generated Job Description")
+                    st.markdown(formatted_output)
+                    
+                    # Download button
+                    st.download_button(
+                        label="📥 Download as Markdown File",
+                        data=formatted_output,
+                        file_name=f"job_description_{job_desc.job_title.lower().replace(' ', '_')}.md",
+                        mime="text/markdown",
+                        use_container_width=True
+                    )
+                    
+                    # Celebration
+                    st.balloons()
+                    
+                except TruncatedResponseError:
+                    placeholder.empty()
+                    st.error("❌ The job description was cut off before it was complete.")
+                    st.info("💡 Try a shorter, more focused description of the role.")
+                except InvalidResponseError as e:
+                    placeholder.empty()
+                    st.error(f"❌ The model returned an invalid job description: {str(e)}")
+                    st.info("💡 Please try generating it again.")
+                except Exception as e:
+                    placeholder.empty()
+                    st.error(f"❌ Error: {str(e)}")
+                    st.info("💡 Try rephrasing your input or check your API configuration.")
             else:
                 st.warning("⚠️ Please enter a job description to generate.")
     
     with col2:
         # Features list
         st.markdown("### ✨ Features")
-        features = [
-            "🎯 Professional formatting",
-            "📋 Industry-standard sections",
-            "🌍 Inclusive language", 
-            "💰 Realistic salary ranges",
-            "🏢 Company culture info",
-            "🎁 Benefits package",
-            "📄 Markdown export",
-            "⚡ Instant generation"
-        ]
-        
-        for feature in features:
+        for feature in FEATURES:
             st.markdown(feature)
         
         # Info box
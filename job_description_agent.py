@@ -1,8 +1,7 @@
 import os
+import re
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from openai import OpenAI
 import json
@@ -11,6 +10,37 @@ from knowledge_base import KnowledgeBase
 # Load environment variables
 load_dotenv()
 
+# Experience level keywords, checked in priority order against the lowercased input.
+# Matched as substrings so inflected and compound forms ("leader", "directors", "svp",
+# "fresher") still count
+_EXPERIENCE_LEVEL_PATTERNS = [
+    ("entry", re.compile(r"entry|junior|fresh|new graduate")),
+    ("mid", re.compile(r"mid|intermediate|experienced")),
+    ("senior", re.compile(r"senior|lead|principal")),
+    ("executive", re.compile(r"executive|director|vp|head|chief"))
+]
+
+# Job description prompt; format_instructions is filled in with FORMAT_INSTRUCTIONS
+_PROMPT_TEMPLATE = """You are an expert HR professional and job description writer. 
+Create a comprehensive, professional job description based on the following input: {job_input}
+
+{organization_context}
+
+Please generate a detailed job description that includes all the required fields.
+Make sure the job description is:
+- Professional and engaging
+- Specific to the role and experience level
+- Inclusive and welcoming to diverse candidates
+- Realistic in terms of requirements and expectations
+- Aligned with current industry standards
+- Tailored to the specific organization's culture, values, and requirements
+
+{format_instructions}
+
+IMPORTANT: Return only valid JSON matching the schema. Do not include any extra text.
+
+Job Input: {job_input}"""
+
 class JobDescription(BaseModel):
     """Structured output for job description"""
     job_title: str = Field(description="The official job title")
@@ -26,6 +56,18 @@ class JobDescription(BaseModel):
     benefits: list = Field(description="List of benefits offered")
     company_culture: str = Field(description="Brief description of company culture and values")
 
+# Output format instructions describing the JobDescription JSON schema
+_SCHEMA = {k: v for k, v in JobDescription.model_json_schema().items() if k not in ("title", "type")}
+FORMAT_INSTRUCTIONS = f"""The output should be formatted as a JSON instance that conforms to the JSON schema below.
+
+As an example, for the schema {{"properties": {{"foo": {{"title": "Foo", "description": "a list of strings", "type": "array", "items": {{"type": "string"}}}}}}, "required": ["foo"]}}
+the object {{"foo": ["bar", "baz"]}} is a well-formatted instance of the schema. The object {{"properties": {{"foo": ["bar", "baz"]}}}} is not well-formatted.
+
+Here is the output schema:
+```
+{json.dumps(_SCHEMA, ensure_ascii=False)}
+```"""
+
 class JobDescriptionAgent:
     def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.7):
         """Initialize the job description agent"""
@@ -36,33 +78,7 @@ class JobDescriptionAgent:
         self.model_name = model_name
         self.temperature = temperature
 
-        self.output_parser = PydanticOutputParser(pydantic_object=JobDescription)
         self.knowledge_base = KnowledgeBase()
-        
-        # Create the prompt template
-        self.prompt = PromptTemplate(
-            template="""You are an expert HR professional and job description writer. 
-            Create a comprehensive, professional job description based on the following input: {job_input}
-            
-            {organization_context}
-            
-            Please generate a detailed job description that includes all the required fields.
-            Make sure the job description is:
-            - Professional and engaging
-            - Specific to the role and experience level
-            - Inclusive and welcoming to diverse candidates
-            - Realistic in terms of requirements and expectations
-            - Aligned with current industry standards
-            - Tailored to the specific organization's culture, values, and requirements
-            
-            {format_instructions}
-            
-            IMPORTANT: Return only valid JSON matching the schema. Do not include any extra text.
-            
-            Job Input: {job_input}""",
-            input_variables=["job_input", "organization_context"],
-            partial_variables={"format_instructions": self.output_parser.get_format_instructions()}
-        )
     
     def generate_job_description(self, job_input: str, organization_id: Optional[str] = None) -> Optional[JobDescription]:
         """Generate a job description from the input with optional organization context"""
@@ -80,15 +96,17 @@ class JobDescriptionAgent:
                 organization_context = "Generate a general job description without specific company details."
             
             # Build prompt text
-            prompt_text = self.prompt.format(
+            prompt_text = _PROMPT_TEMPLATE.format(
                 job_input=job_input,
-                organization_context=organization_context
+                organization_context=organization_context,
+                format_instructions=FORMAT_INSTRUCTIONS
             )
             
             # Call OpenAI Chat Completions
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 temperature=self.temperature,
+                response_format={"type": "json_object"},
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that returns only JSON."},
                     {"role": "user", "content": prompt_text}
@@ -99,7 +117,7 @@ class JobDescriptionAgent:
                 return None
             
             # Parse to Pydantic model
-            return self.output_parser.parse(content)
+            return JobDescription.model_validate_json(content)
         except Exception as e:
             print(f"Error generating job description: {e}")
             return None
@@ -108,20 +126,11 @@ class JobDescriptionAgent:
         """Extract role and experience level from job input"""
         input_lower = job_input.lower()
         
-        # Common experience level keywords
-        experience_keywords = {
-            "entry": ["entry", "entry level", "junior", "fresh", "new graduate"],
-            "mid": ["mid", "mid level", "intermediate", "experienced"],
-            "senior": ["senior", "senior level", "lead", "principal"],
-            "executive": ["executive", "director", "vp", "head", "chief"]
-        }
-        
         # Determine experience level
-        experience_level = "mid"  # default
-        for level, keywords in experience_keywords.items():
-            if any(keyword in input_lower for keyword in keywords):
-                experience_level = level
-                break
+        experience_level = next(
+            (level for level, pattern in _EXPERIENCE_LEVEL_PATTERNS if pattern.search(input_lower)),
+            "mid"  # default
+        )
         
         # Extract role (simplified)
         role = job_input.split()[0] if job_input else "developer"
@@ -184,49 +193,35 @@ class JobDescriptionAgent:
         if not job_desc:
             return "Error: Could not generate job description"
         
-        formatted = f"""
-# {job_desc.job_title}
-
-**Department:** {job_desc.department}  
-**Experience Level:** {job_desc.experience_level}  
-**Location:** {job_desc.location}  
-**Salary Range:** {job_desc.salary_range}
-
-## Job Summary
-{job_desc.job_summary}
-
-## Key Responsibilities
-"""
-        for i, responsibility in enumerate(job_desc.key_responsibilities, 1):
-            formatted += f"{i}. {responsibility}\n"
+        parts = [
+            "",
+            f"# {job_desc.job_title}",
+            "",
+            f"**Department:** {job_desc.department}  ",
+            f"**Experience Level:** {job_desc.experience_level}  ",
+            f"**Location:** {job_desc.location}  ",
+            f"**Salary Range:** {job_desc.salary_range}",
+            "",
+            "## Job Summary",
+            job_desc.job_summary,
+            "",
+            "## Key Responsibilities"
+        ]
+        parts.extend(f"{i}. {responsibility}" for i, responsibility in enumerate(job_desc.key_responsibilities, 1))
         
-        formatted += f"""
-## Required Skills
-"""
-        for skill in job_desc.required_skills:
-            formatted += f"• {skill}\n"
+        parts += ["", "## Required Skills"]
+        parts.extend(f"• {skill}" for skill in job_desc.required_skills)
         
         if job_desc.preferred_skills:
-            formatted += f"""
-## Preferred Skills
-"""
-            for skill in job_desc.preferred_skills:
-                formatted += f"• {skill}\n"
+            parts += ["", "## Preferred Skills"]
+            parts.extend(f"• {skill}" for skill in job_desc.preferred_skills)
         
-        formatted += f"""
-## Education
-{job_desc.education}
-
-## Benefits
-"""
-        for benefit in job_desc.benefits:
-            formatted += f"• {benefit}\n"
+        parts += ["", "## Education", job_desc.education, "", "## Benefits"]
+        parts.extend(f"• {benefit}" for benefit in job_desc.benefits)
+        
+        parts += ["", "## Company Culture", job_desc.company_culture, ""]
         
-        formatted += f"""
-## Company Culture
-{job_desc.company_culture}
-"""
-        return formatted
+        return "\n".join(parts)
 
 def main():
     """Main function to run the job description agent"""
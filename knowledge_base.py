@@ -1,10 +1,82 @@
 import json
+import logging
+import mmap
 import os
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import tempfile
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; list_organizations falls back to a full load
+    ijson = None
+
+# Files larger than this are parsed from a memory map instead of being read into memory
+_MMAP_THRESHOLD = 512 * 1024
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _read_json_file(path: Path) -> Any:
+    """Read and parse a JSON file, memory-mapping large files when orjson is available"""
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            # orjson parses straight from the mapped pages, skipping the copy into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return _json_loads(f.read())
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _write_json_atomic(path: Path, obj: Any):
+    """Write JSON through a buffered temp file, then swap it into place in one step"""
+    # A unique temp name per write, so concurrent writers never share (and truncate) one file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        # mkstemp creates the file owner-only; keep the permissions of the file being replaced.
+        # os.chmod takes the path because os.fchmod is missing on Windows before Python 3.13
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        with open(fd, 'wb', buffering=65536) as f:
+            f.write(_json_dumps(obj))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def _now_iso() -> str:
+    """Current local time as an ISO 8601 timestamp, to the second"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+# Experience level -> key of the matching salary_ranges table
+_SALARY_LEVEL_KEYS = {
+    "entry": "entry_level",
+    "junior": "entry_level",
+    "mid": "mid_level",
+    "senior": "senior_level",
+    "executive": "executive_level"
+}
+
 @dataclass
 class CompanyInfo:
     """Company basic information"""
@@ -71,15 +143,28 @@ class KnowledgeBase:
     
     def __init__(self, data_dir: str = "knowledge_base"):
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(exist_ok=True)
         self.organizations_file = self.data_dir / "organizations.json"
         self.templates_file = self.data_dir / "job_templates.json"
         
-        # Initialize files if they don't exist
-        self._initialize_files()
+        # Parsed file contents, reused until the file's mtime changes
+        self._orgs_cache: Optional[Dict[str, Any]] = None
+        self._orgs_mtime = -1
+        self._templates_cache: Optional[Dict[str, Any]] = None
+        self._templates_mtime = -1
+        
+        # Per-organization {lowercased role: department dict}, built on first lookup
+        self._dept_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        
+        # Files are created on first use rather than on every construction
+        self._initialized = False
     
     def _initialize_files(self):
-        """Initialize knowledge base files if they don't exist"""
+        """Initialize knowledge base files if they don't exist, once per instance"""
+        if self._initialized:
+            return
+        self.data_dir.mkdir(exist_ok=True)
+        self._initialized = True
+        
         if not self.organizations_file.exists():
             self._save_organizations({})
         
@@ -117,7 +202,7 @@ class KnowledgeBase:
             organizations = self._load_organizations()
             
             # Update last_updated timestamp
-            data.last_updated = datetime.now().isoformat()
+            data.last_updated = _now_iso()
             
             # Convert to dictionary
             org_data = asdict(data)
@@ -125,30 +210,43 @@ class KnowledgeBase:
             
             self._save_organizations(organizations)
             return True
-        except Exception as e:
-            print(f"Error adding organization: {e}")
+        except Exception:
+            logger.exception("Error adding organization %s", org_id)
             return False
     
     def get_organization(self, org_id: str) -> Optional[OrganizationalData]:
         """Retrieve organization data by ID"""
         try:
-            organizations = self._load_organizations()
-            if org_id in organizations:
-                org_data = organizations[org_id]
+            org_data = self._get_organization_raw(org_id)
+            if org_data:
                 return self._dict_to_organizational_data(org_data)
             return None
-        except Exception as e:
-            print(f"Error retrieving organization: {e}")
+        except Exception:
+            logger.exception("Error retrieving organization %s", org_id)
             return None
     
-    def list_organizations(self) -> List[str]:
+    def _get_organization_raw(self, org_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve the organization's data as loaded from JSON, without building dataclasses"""
+        return self._load_organizations().get(org_id)
+    
+    def list_organizations(self) -> Tuple[str, ...]:
         """List all organization IDs in the knowledge base"""
         try:
-            organizations = self._load_organizations()
-            return list(organizations.keys())
-        except Exception as e:
-            print(f"Error listing organizations: {e}")
-            return []
+            self._initialize_files()
+            
+            # A large file with no current cached copy is only scanned for its top-level
+            # keys; anything smaller is parsed in full, which is faster and warms the cache
+            if (ijson is not None and not self._orgs_cache_is_current()
+                    and self.organizations_file.stat().st_size > _MMAP_THRESHOLD):
+                with open(self.organizations_file, 'rb') as f:
+                    return tuple(value for prefix, event, value in ijson.parse(f) if prefix == '' and event == 'map_key')
+            
+            return tuple(self._load_organizations())
+        except FileNotFoundError:
+            return ()
+        except Exception:
+            logger.exception("Error listing organizations")
+            return ()
     
     def delete_organization(self, org_id: str) -> bool:
         """Delete an organization from the knowledge base"""
@@ -159,8 +257,8 @@ class KnowledgeBase:
                 self._save_organizations(organizations)
                 return True
             return False
-        except Exception as e:
-            print(f"Error deleting organization: {e}")
+        except Exception:
+            logger.exception("Error deleting organization %s", org_id)
             return False
     
     def update_organization_field(self, org_id: str, field: str, value: Any) -> bool:
@@ -170,105 +268,134 @@ class KnowledgeBase:
             if org_id in organizations:
                 org_data = organizations[org_id]
                 org_data[field] = value
-                org_data['last_updated'] = datetime.now().isoformat()
+                org_data['last_updated'] = _now_iso()
                 self._save_organizations(organizations)
                 return True
             return False
-        except Exception as e:
-            print(f"Error updating organization field: {e}")
+        except Exception:
+            logger.exception("Error updating field %s of organization %s", field, org_id)
             return False
     
     def get_job_context(self, org_id: str, role: str, experience_level: str) -> Dict[str, Any]:
         """Get contextual information for job description generation"""
         try:
-            org_data = self.get_organization(org_id)
+            # The context is read-only, so work on the loaded JSON directly
+            # rather than building dataclasses and converting them back
+            org_data = self._get_organization_raw(org_id)
             if not org_data:
                 return {}
             
+            company_info = org_data['company_info']
+            culture = org_data['culture']
+            
             # Get salary range for the role and experience level
-            salary_range = self._get_salary_range(org_data.salary_ranges, role, experience_level)
+            salary_range = self._get_salary_range(org_data['salary_ranges'], role, experience_level)
             
             # Get department info if available
-            department_info = self._get_department_info(org_data.departments, role)
+            department_info = self._get_department_info(org_id, role)
             
             context = {
-                "company_name": org_data.company_info.name,
-                "industry": org_data.company_info.industry,
-                "company_size": org_data.company_info.size,
-                "location": org_data.company_info.location,
-                "mission": org_data.culture.mission,
-                "values": org_data.culture.values,
-                "work_style": org_data.culture.work_style,
-                "benefits": asdict(org_data.benefits),
+                "company_name": company_info['name'],
+                "industry": company_info['industry'],
+                "company_size": company_info['size'],
+                "location": company_info['location'],
+                "mission": culture['mission'],
+                "values": culture['values'],
+                "work_style": culture['work_style'],
+                "benefits": org_data['benefits'],
                 "salary_range": salary_range,
                 "department_info": department_info,
-                "tech_stack": org_data.tech_stack or [],
-                "tools_platforms": org_data.tools_platforms or [],
-                "certifications_preferred": org_data.certifications_preferred or []
+                "tech_stack": org_data.get('tech_stack') or [],
+                "tools_platforms": org_data.get('tools_platforms') or [],
+                "certifications_preferred": org_data.get('certifications_preferred') or []
             }
             
             return context
-        except Exception as e:
-            print(f"Error getting job context: {e}")
+        except Exception:
+            logger.exception("Error getting job context for organization %s", org_id)
             return {}
     
-    def _get_salary_range(self, salary_ranges: SalaryRanges, role: str, experience_level: str) -> str:
+    def _get_salary_range(self, salary_ranges: Dict[str, Dict[str, str]], role: str, experience_level: str) -> str:
         """Get salary range for a specific role and experience level"""
-        level_map = {
-            "entry": salary_ranges.entry_level,
-            "junior": salary_ranges.entry_level,
-            "mid": salary_ranges.mid_level,
-            "senior": salary_ranges.senior_level,
-            "executive": salary_ranges.executive_level
-        }
-        
-        level_data = level_map.get(experience_level.lower(), salary_ranges.mid_level)
+        level_data = salary_ranges[_SALARY_LEVEL_KEYS.get(experience_level.lower(), 'mid_level')]
         return level_data.get(role.lower(), "Competitive salary based on experience")
     
-    def _get_department_info(self, departments: List[DepartmentInfo], role: str) -> Optional[Dict[str, Any]]:
+    def _get_department_info(self, org_id: str, role: str) -> Optional[Dict[str, Any]]:
         """Get department information for a specific role"""
-        for dept in departments:
-            if role.lower() in [r.lower() for r in dept.typical_roles]:
-                return asdict(dept)
-        return None
+        index = self._dept_index.get(org_id)
+        if index is None:
+            index = {}
+            for dept in self._get_organization_raw(org_id)['departments']:
+                for typical_role in dept['typical_roles']:
+                    # The first department listing a role wins
+                    index.setdefault(typical_role.lower(), dept)
+            self._dept_index[org_id] = index
+        return index.get(role.lower())
+    
+    def _orgs_cache_is_current(self) -> bool:
+        """Whether the cached organizations still match the file on disk"""
+        try:
+            return self._orgs_cache is not None and self.organizations_file.stat().st_mtime_ns == self._orgs_mtime
+        except FileNotFoundError:
+            return False
     
     def _load_organizations(self) -> Dict[str, Any]:
-        """Load organizations data from file"""
+        """Load organizations data from file, reusing the parsed copy while the file is unchanged"""
         try:
-            with open(self.organizations_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            self._initialize_files()
+            mtime = self.organizations_file.stat().st_mtime_ns
+            if self._orgs_cache is not None and mtime == self._orgs_mtime:
+                return self._orgs_cache
+            
+            organizations = _read_json_file(self.organizations_file)
+            self._orgs_cache, self._orgs_mtime = organizations, mtime
+            self._dept_index.clear()
+            return organizations
         except FileNotFoundError:
             return {}
-        except Exception as e:
-            print(f"Error loading organizations: {e}")
+        except Exception:
+            logger.exception("Error loading organizations")
             return {}
     
     def _save_organizations(self, organizations: Dict[str, Any]):
         """Save organizations data to file"""
+        self._dept_index.clear()
         try:
-            with open(self.organizations_file, 'w', encoding='utf-8') as f:
-                json.dump(organizations, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving organizations: {e}")
+            self._initialize_files()
+            _write_json_atomic(self.organizations_file, organizations)
+            self._orgs_cache, self._orgs_mtime = organizations, self.organizations_file.stat().st_mtime_ns
+        except Exception:
+            # Drop the cache so the next load re-reads whatever is on disk
+            self._orgs_cache = None
+            logger.exception("Error saving organizations")
     
     def _load_templates(self) -> Dict[str, Any]:
-        """Load job templates from file"""
+        """Load job templates from file, reusing the parsed copy while the file is unchanged"""
         try:
-            with open(self.templates_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            self._initialize_files()
+            mtime = self.templates_file.stat().st_mtime_ns
+            if self._templates_cache is not None and mtime == self._templates_mtime:
+                return self._templates_cache
+            
+            templates = _read_json_file(self.templates_file)
+            self._templates_cache, self._templates_mtime = templates, mtime
+            return templates
         except FileNotFoundError:
             return self._get_default_templates()
-        except Exception as e:
-            print(f"Error loading templates: {e}")
+        except Exception:
+            logger.exception("Error loading templates")
             return self._get_default_templates()
     
     def _save_templates(self, templates: Dict[str, Any]):
         """Save job templates to file"""
         try:
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump(templates, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving templates: {e}")
+            self._initialize_files()
+            _write_json_atomic(self.templates_file, templates)
+            self._templates_cache, self._templates_mtime = templates, self.templates_file.stat().st_mtime_ns
+        except Exception:
+            # Drop the cache so the next load re-reads whatever is on disk
+            self._templates_cache = None
+            logger.exception("Error saving templates")
     
     def _dict_to_organizational_data(self, data: Dict[str, Any]) -> OrganizationalData:
         """Convert dictionary back to OrganizationalData object"""
@@ -289,22 +416,20 @@ class KnowledgeBase:
         try:
             org_data = self.get_organization(org_id)
             if org_data:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(asdict(org_data), f, indent=2, ensure_ascii=False)
+                _write_json_atomic(Path(filepath), asdict(org_data))
                 return True
             return False
-        except Exception as e:
-            print(f"Error exporting organization: {e}")
+        except Exception:
+            logger.exception("Error exporting organization %s", org_id)
             return False
     
     def import_organization(self, org_id: str, filepath: str) -> bool:
         """Import organization data from a JSON file"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(filepath)
             
             org_data = self._dict_to_organizational_data(data)
             return self.add_organization(org_id, org_data)
-        except Exception as e:
-            print(f"Error importing organization: {e}")
+        except Exception:
+            logger.exception("Error importing organization %s", org_id)
             return False
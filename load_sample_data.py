@@ -38,13 +38,15 @@ def load_sample_data():
         print("❌ No sample data found. Please check knowledge_base/organizations.json")
         return
     
-    # Display loaded organizations
+    # Validate each organization once, remembering its name for the summary
     success_count = 0
+    company_names = {}
     for org_id in organizations:
         org_data = kb.get_organization(org_id)
         if org_data:
             print(f"Processing {org_id}...")
             print(f"✅ Successfully added {org_id}")
+            company_names[org_id] = org_data.company_info.name
             success_count += 1
         else:
             print(f"❌ Failed to load {org_id}")
@@ -52,10 +54,8 @@ def load_sample_data():
     print(f"\n🎉 Sample data loading completed!")
     print(f"\nAvailable organizations:")
     
-    for org_id in organizations:
-        org_data = kb.get_organization(org_id)
-        if org_data:
-            print(f"  - {org_id}: {org_data.company_info.name}")
+    for org_id, company_name in company_names.items():
+        print(f"  - {org_id}: {company_name}")
     
     print(f"\n💡 You can now use these organization IDs in the job description agent:")
     for org_id in organizations:
@@ -1,7 +1,9 @@
 import streamlit as st
 import os
+import sys
 from dotenv import load_dotenv
 from job_description_agent import JobDescriptionAgent
+from knowledge_base import KnowledgeBase
 import time
 
 # Load environment variables
@@ -14,8 +16,28 @@ st.set_page_config(
 	layout="wide"
 )
 
+# Quick examples offered above the form or in the sidebar
+EXAMPLES = [
+	"web developer with 5 years experience",
+	"senior data scientist",
+	"marketing manager entry level",
+	"software engineer remote",
+	"product manager fintech"
+]
+
+FEATURES = [
+	"✅ Professional formatting",
+	"✅ Industry-standard sections",
+	"✅ Inclusive language",
+	"✅ Realistic requirements",
+	"✅ Salary expectations",
+	"✅ Company culture",
+	"✅ Benefits package",
+	"✅ Export to Markdown"
+]
+
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
 <style>
 	.main-header {
 		font-size: 3rem;
@@ -68,9 +90,52 @@ st.markdown("""
 		margin: 1rem 0;
 	}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def get_kb():
+	"""Create the knowledge base once and share it across reruns"""
+	return KnowledgeBase()
+
+@st.cache_resource
+def get_agent(model_name: str):
+	"""Create one agent per model and share it across reruns"""
+	return JobDescriptionAgent(model_name=model_name)
+
+@st.cache_data(ttl=30)
+def list_organization_ids():
+	"""Organization IDs for the selector, refreshed at most every 30 seconds"""
+	return get_kb().list_organizations()
+
+def _use_example(example: str):
+	"""Load an example into the job input and rerun"""
+	st.session_state.job_input = example
+	st.rerun()
+
+def _render_example_row():
+	"""Render the quick examples as a row of buttons"""
+	st.markdown("### 📚 Quick Examples")
+	st.markdown("Click any example to use it:")
+	
+	for col, example in zip(st.columns(len(EXAMPLES)), EXAMPLES):
+		with col:
+			if st.button(example, key=example, use_container_width=True):
+				_use_example(example)
 
-def main():
+def _render_sidebar():
+	"""Render the quick examples in the sidebar"""
+	with st.sidebar:
+		st.header("📚 Quick Examples")
+		st.markdown("Click any example to try it:")
+		
+		for example in EXAMPLES:
+			if st.button(example, key=example, use_container_width=True):
+				_use_example(example)
+
+def main(show_sidebar: bool = False):
+	# Styles have to be emitted on every rerun; Streamlit drops elements a rerun does not re-create
+	st.markdown(_CSS, unsafe_allow_html=True)
+	
 	# Header
 	st.markdown('<h1 class="main-header">🤖 Job Description Agent</h1>', unsafe_allow_html=True)
 	st.markdown('<p class="sub-header">Generate comprehensive job descriptions from simple inputs using AI</p>', unsafe_allow_html=True)
@@ -80,24 +145,11 @@ def main():
 	model_name = "gpt-4o-mini"  # Default model
 	temperature = 0.7  # Default creativity level
 	
-	# Quick examples section
-	st.markdown("### 📚 Quick Examples")
-	st.markdown("Click any example to use it:")
-	
-	col1, col2, col3, col4, col5 = st.columns(5)
-	examples = [
-		"web developer with 5 years experience",
-		"senior data scientist",
-		"marketing manager entry level",
-		"software engineer remote",
-		"product manager fintech"
-	]
-	
-	for i, example in enumerate(examples):
-		with [col1, col2, col3, col4, col5][i]:
-			if st.button(example, key=example, use_container_width=True):
-				st.session_state.job_input = example
-				st.rerun()
+	# Quick examples, either in the sidebar or as a row above the form
+	if show_sidebar:
+		_render_sidebar()
+	else:
+		_render_example_row()
 	
 	# Main content
 	col1, col2 = st.columns([2, 1])
@@ -107,15 +159,13 @@ def main():
 		st.header("📝 Job Description Request")
 		
 		# Organization selection
-		from knowledge_base import KnowledgeBase
-		kb = KnowledgeBase()
-		organizations = kb.list_organizations()
+		organizations = list_organization_ids()
 		
 		if organizations:
 			st.subheader("🏢 Organization Selection")
 			selected_org = st.selectbox(
 				"Choose an organization (optional)",
-				["General Description"] + organizations,
+				["General Description", *organizations],
 				help="Select an organization to generate company-specific job descriptions"
 			)
 			if selected_org == "General Description":
@@ -152,18 +202,7 @@ def main():
 		st.markdown('<div class="input-container">', unsafe_allow_html=True)
 		st.header("📊 Features")
 		
-		features = [
-			"✅ Professional formatting",
-			"✅ Industry-standard sections",
-			"✅ Inclusive language",
-			"✅ Realistic requirements",
-			"✅ Salary expectations",
-			"✅ Company culture",
-			"✅ Benefits package",
-			"✅ Export to Markdown"
-		]
-		
-		for feature in features:
+		for feature in FEATURES:
 			st.markdown(feature)
 		
 		st.markdown("</div>", unsafe_allow_html=True)
@@ -177,8 +216,8 @@ def main():
 		
 		try:
 			with st.spinner("🔄 Generating your job description..."):
-				# Initialize agent
-				agent = JobDescriptionAgent(model_name=model_name)
+				# Reuse the agent cached for this model
+				agent = get_agent(model_name)
 				agent.temperature = temperature
 				
 				# Generate description
@@ -214,11 +253,12 @@ def main():
 	st.markdown("---")
 	st.markdown(
 		"<div style='text-align: center; color: #666;'>"
-		"Built with ❤️ using LangChain and Streamlit | "
+		"Built with ❤️ using Streamlit | "
 		"Powered by OpenAI GPT models"
 		"</div>",
 		unsafe_allow_html=True
 	)
 
 if __name__ == "__main__":
-	main()
+	# `streamlit run streamlit_app.py -- --sidebar` shows the examples in the sidebar
+	main(show_sidebar="--sidebar" in sys.argv)